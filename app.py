@@ -157,7 +157,7 @@ def generate_pdf_with_charts(filtered_all, filtered_sold, metrics_df, brand, cat
         ).dt.total_seconds() / (24 * 3600)
         
         median_dts = sold_calc['dts'].median()
-        sold_30d = len(sold_calc[sold_calc['dts'] <= 30])
+        sold_30d = int((sold_calc['dts'] <= 30).sum())
         st_rate = min((sold_30d / len(filtered_all)) * 100, 100.0)
     else:
         median_dts = None
@@ -166,7 +166,7 @@ def generate_pdf_with_charts(filtered_all, filtered_sold, metrics_df, brand, cat
     kpi_data = [
         ['Metric', 'Value'],
         ['Total Items Analyzed', f"{len(filtered_all):,}"],
-        ['Active Listings', f"{len(filtered_all[filtered_all['status']=='active']):,}"],
+        ['Active Listings', f"{int((filtered_all['status'] == 'active').sum()):,}"],
         ['Sold Items', f"{len(filtered_sold):,}"],
         ['Median Price', f"EUR {median_price:.2f}"],
         ['Median DTS', f"{median_dts:.1f} days" if median_dts else 'N/A'],
@@ -363,8 +363,8 @@ page = st.sidebar.radio(
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 📈 Data Summary")
 
-active_count = len(listings_df[listings_df['status'] == 'active'])
-sold_count = len(listings_df[listings_df['status'] == 'sold'])
+active_count = int((listings_df['status'] == 'active').sum())
+sold_count = int((listings_df['status'] == 'sold').sum())
 total_count = len(listings_df)
 
 st.sidebar.metric("Total Listings", f"{total_count:,}")
@@ -400,7 +400,7 @@ if "Overview" in page:
         selected_condition = st.selectbox("Condition", conditions, key="overview_cond")
     
     # Apply filters
-    filtered = listings_df.copy()
+    filtered = listings_df
     if selected_category != 'All Categories':
         filtered = filtered[filtered['category_norm'] == selected_category]
     if selected_audience != 'All Audiences':
@@ -418,60 +418,52 @@ if "Overview" in page:
         st.warning("No brands found with selected filters")
         st.stop()
     
-    # Calculate KPIs
+    # Calculate KPIs for all top brands in one grouped pass
     with st.spinner(f'Calculating KPIs for top {len(top_brands)} brands...'):
-        liquidity_data = []
-        progress_bar = st.progress(0)
+        top_df = filtered.loc[
+            filtered['brand_norm'].isin(top_brands),
+            ['brand_norm', 'status', 'first_seen_at', 'last_seen_at']
+        ]
+        top_sold = top_df[top_df['status'] == 'sold']
         
-        for idx, brand in enumerate(top_brands):
-            brand_data = filtered[filtered['brand_norm'] == brand]
-            brand_sold = brand_data[brand_data['status'] == 'sold'].copy()
-            
-            if len(brand_data) < 10:
-                continue
-            
-            # Calculate DTS
-            if len(brand_sold) > 0:
-                brand_sold['estimated_sold_at'] = pd.to_datetime(brand_sold['last_seen_at']) + timedelta(hours=24)
-                brand_sold['dts'] = (
-                    brand_sold['estimated_sold_at'] - pd.to_datetime(brand_sold['first_seen_at'])
-                ).dt.total_seconds() / (24 * 3600)
-                
-                median_dts = brand_sold['dts'].median()
-                sold_30d = len(brand_sold[brand_sold['dts'] <= 30])
-                st_rate = min((sold_30d / len(brand_data)) * 100, 100.0)
-                
-                # Liquidity score
-                st_normalized = min(st_rate / 50, 1.0)
-                sell_through_score = st_normalized * 50
-                dts_score = max(0, (1 - (median_dts / 30)) * 50)
-                liq_score = min(sell_through_score + dts_score, 100.0)
-                
-                if liq_score >= 75:
-                    grade = 'A'
-                elif liq_score >= 50:
-                    grade = 'B'
-                elif liq_score >= 25:
-                    grade = 'C'
-                else:
-                    grade = 'D'
-                
-                liquidity_data.append({
-                    'Brand': brand,
-                    'Liquidity Score': liq_score,
-                    'Grade': grade,
-                    'DTS (days)': median_dts,
-                    'Sell-Through (%)': st_rate,
-                    'Total Items': len(brand_data),
-                    'Sold Items': len(brand_sold)
-                })
-            
-            progress_bar.progress((idx + 1) / len(top_brands))
+        # DTS: (last_seen_at + 24h) - first_seen_at
+        sold_dts = (
+            pd.to_datetime(top_sold['last_seen_at']) + timedelta(hours=24) - pd.to_datetime(top_sold['first_seen_at'])
+        ).dt.total_seconds() / (24 * 3600)
+        sold_by_brand = sold_dts.groupby(top_sold['brand_norm'])
         
-        progress_bar.empty()
+        brand_stats = pd.DataFrame({
+            'Total Items': top_df.groupby('brand_norm').size(),
+            'Sold Items': sold_by_brand.size(),
+            'DTS (days)': sold_by_brand.median(),
+            'Sold 30d': (sold_dts <= 30).groupby(top_sold['brand_norm']).sum()
+        })
+        brand_stats = brand_stats[(brand_stats['Total Items'] >= 10) & (brand_stats['Sold Items'] > 0)]
+        
+        # Liquidity score
+        st_rate = (brand_stats['Sold 30d'] / brand_stats['Total Items'] * 100).clip(upper=100.0)
+        sell_through_score = (st_rate / 50).clip(upper=1.0) * 50
+        dts_score = ((1 - brand_stats['DTS (days)'] / 30) * 50).clip(lower=0)
+        liq_score = (sell_through_score + dts_score).clip(upper=100.0)
+        grade = pd.cut(
+            liq_score,
+            bins=[float('-inf'), 25, 50, 75, float('inf')],
+            labels=['D', 'C', 'B', 'A'],
+            right=False
+        ).astype(str)
+        
+        liquidity_df = pd.DataFrame({
+            'Brand': brand_stats.index,
+            'Liquidity Score': liq_score.values,
+            'Grade': grade.values,
+            'DTS (days)': brand_stats['DTS (days)'].values,
+            'Sell-Through (%)': st_rate.values,
+            'Total Items': brand_stats['Total Items'].astype(int).values,
+            'Sold Items': brand_stats['Sold Items'].astype(int).values
+        })
     
-    if liquidity_data:
-        liquidity_df = pd.DataFrame(liquidity_data).sort_values('Liquidity Score', ascending=False)
+    if not liquidity_df.empty:
+        liquidity_df = liquidity_df.sort_values('Liquidity Score', ascending=False)
         
         st.subheader("Brand Liquidity Ranking")
         
@@ -577,7 +569,7 @@ elif "Brand·Category Analysis" in page:
             selected_season = 'All'
     
     # Apply filters
-    filtered_all = listings_df.copy()
+    filtered_all = listings_df
     if selected_brand != 'All':
         filtered_all = filtered_all[filtered_all['brand_norm'] == selected_brand]
     if selected_category != 'All':
@@ -627,7 +619,7 @@ elif "Brand·Category Analysis" in page:
     
     with col4:
         if len(filtered_sold) > 0 and 'dts_calc' in filtered_sold.columns:
-            sold_30d = len(filtered_sold[filtered_sold['dts_calc'] <= 30])
+            sold_30d = int((filtered_sold['dts_calc'] <= 30).sum())
             st_rate = min((sold_30d / len(filtered_all)) * 100, 100.0)
             st.metric("30d Sell-Through", f"{st_rate:.1f}%")
             st.caption(f"{sold_30d}/{len(filtered_all)} items")
@@ -642,14 +634,14 @@ elif "Brand·Category Analysis" in page:
     
     condition_metrics = []
     for condition in sorted(filtered_all['condition_bucket'].unique()):
-        cond_all = filtered_all[filtered_all['condition_bucket'] == condition]
+        cond_all = filtered_all.loc[filtered_all['condition_bucket'] == condition, ['price']]
         cond_sold = filtered_sold[filtered_sold['condition_bucket'] == condition] if len(filtered_sold) > 0 else pd.DataFrame()
         
         median_price_cond = cond_all['price'].median()
         
         if len(cond_sold) > 0 and 'dts_calc' in cond_sold.columns:
             median_dts_cond = cond_sold['dts_calc'].median()
-            sold_30d_cond = len(cond_sold[cond_sold['dts_calc'] <= 30])
+            sold_30d_cond = int((cond_sold['dts_calc'] <= 30).sum())
             st_rate_cond = min((sold_30d_cond / len(cond_all)) * 100, 100.0)
         else:
             median_dts_cond = None
@@ -765,8 +757,8 @@ elif "Brand·Category Analysis" in page:
         if len(filtered_sold) > 0:
             display_cols = ['brand_norm', 'category_norm', 'condition_bucket', 'price', 'first_seen_at', 'last_seen_at']
             display_cols = [col for col in display_cols if col in filtered_sold.columns]
-            st.dataframe(filtered_sold[display_cols].head(100), use_container_width=True, hide_index=True)
-            st.caption(f"Showing first 100 of {len(filtered_sold):,} sold items")
+            st.dataframe(filtered_sold[display_cols].nlargest(100, 'last_seen_at'), use_container_width=True, hide_index=True)
+            st.caption(f"Showing the 100 most recently seen of {len(filtered_sold):,} sold items")
         else:
             st.info("No sold items in this segment")
     
@@ -775,8 +767,8 @@ elif "Brand·Category Analysis" in page:
         if len(active_items) > 0:
             display_cols = ['brand_norm', 'category_norm', 'condition_bucket', 'price', 'first_seen_at', 'last_seen_at']
             display_cols = [col for col in display_cols if col in active_items.columns]
-            st.dataframe(active_items[display_cols].head(100), use_container_width=True, hide_index=True)
-            st.caption(f"Showing first 100 of {len(active_items):,} active items")
+            st.dataframe(active_items[display_cols].nlargest(100, 'last_seen_at'), use_container_width=True, hide_index=True)
+            st.caption(f"Showing the 100 most recently seen of {len(active_items):,} active items")
         else:
             st.info("No active items in this segment")
     
@@ -11,6 +11,7 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import logging
+import threading
 from datetime import datetime, timedelta
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,6 +19,16 @@ logger = logging.getLogger(__name__)
 
 DATA_DIR = Path("data/processed")
 
+# Low-cardinality columns used in every filter; stored as pandas categoricals
+CATEGORICAL_COLUMNS = ['brand_norm', 'category_norm', 'condition_bucket', 'status', 'audience', 'season']
+
+# Loaded once per process and shared by every calculate_all_kpis() call
+_DATA_CACHE = None
+_DATA_LOCK = threading.Lock()
+
+# calculate_all_kpis() results keyed by filter values; cleared with the data cache
+_KPI_CACHE = {}
+
 
 def load_all_data():
     """Load all processed data files."""
@@ -32,6 +43,10 @@ def load_all_data():
         if col in listings_df.columns:
             listings_df[col] = pd.to_datetime(listings_df[col])
     
+    for col in CATEGORICAL_COLUMNS:
+        if col in listings_df.columns:
+            listings_df[col] = listings_df[col].astype('category')
+    
     logger.info(f"Loaded {len(listings_df)} listings")
     
     # Price events (keep for discount calculations)
@@ -49,9 +64,39 @@ def load_all_data():
     return listings_df, price_events_df
 
 
+def _get_data():
+    """Return cached (listings_df, price_events_df), loading them on first use."""
+    global _DATA_CACHE
+    with _DATA_LOCK:
+        if _DATA_CACHE is None:
+            _DATA_CACHE = load_all_data()
+    return _DATA_CACHE
+
+
+def clear_data_cache():
+    """Drop the cached data and KPI results so the next call re-reads the parquet files."""
+    global _DATA_CACHE
+    with _DATA_LOCK:
+        _DATA_CACHE = None
+        _KPI_CACHE.clear()
+
+
+def _filter_key(value):
+    """Make a filter value hashable (lists become sorted tuples)."""
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted(value))
+    return value
+
+
 def apply_filters(df, brand=None, category=None, audience=None, status=None, season=None):
-    """Apply filters to dataframe."""
-    filtered = df.copy()
+    """
+    Apply filters to dataframe.
+    
+    Each filter returns a new frame, so no defensive copy is made up front.
+    With no filters the input frame itself is returned - callers must not
+    mutate the result in place.
+    """
+    filtered = df
     
     if brand:
         if isinstance(brand, str):
@@ -95,8 +140,8 @@ def calculate_days_to_sell_from_listings(listings_df, brand=None, category=None,
     """
     filtered = apply_filters(listings_df, brand=brand, category=category, audience=audience, season=season)
     
-    # Get only sold items
-    sold_items = filtered[filtered['status'] == 'sold'].copy()
+    # Get only sold items (just the columns DTS needs)
+    sold_items = filtered.loc[filtered['status'] == 'sold', ['first_seen_at', 'last_seen_at']].copy()
     
     if len(sold_items) == 0:
         logger.warning("No sold items match filters for DTS calculation")
@@ -144,8 +189,8 @@ def calculate_sell_through_30d(listings_df, brand=None, category=None, audience=
     # Total items in segment
     denominator = len(filtered_all)
     
-    # Get sold items from the same filtered set
-    sold_items = filtered_all[filtered_all['status'] == 'sold'].copy()
+    # Get sold items from the same filtered set (just the columns DTS needs)
+    sold_items = filtered_all.loc[filtered_all['status'] == 'sold', ['first_seen_at', 'last_seen_at']].copy()
     
     if len(sold_items) == 0:
         return {
@@ -186,17 +231,17 @@ def calculate_price_distribution(listings_df, brand=None, category=None, audienc
         logger.warning("No items match the filters for price distribution")
         return None
     
-    filtered = filtered[filtered['price'] > 0]
+    prices = filtered.loc[filtered['price'] > 0, 'price']
     
     price_stats = {
-        'p25': filtered['price'].quantile(0.25),
-        'p50': filtered['price'].median(),
-        'p75': filtered['price'].quantile(0.75),
-        'mean': filtered['price'].mean(),
-        'min': filtered['price'].min(),
-        'max': filtered['price'].max(),
-        'std': filtered['price'].std(),
-        'count': len(filtered)
+        'p25': prices.quantile(0.25),
+        'p50': prices.median(),
+        'p75': prices.quantile(0.75),
+        'mean': prices.mean(),
+        'min': prices.min(),
+        'max': prices.max(),
+        'std': prices.std(),
+        'count': len(prices)
     }
     
     return price_stats
@@ -212,7 +257,7 @@ def calculate_discount_to_sell(price_events_df, listings_df, brand=None, categor
     
     # Get sold items from listings
     filtered_sold = apply_filters(listings_df, brand=brand, category=category, audience=audience, season=season)
-    filtered_sold = filtered_sold[filtered_sold['status'] == 'sold']
+    filtered_sold = filtered_sold.loc[filtered_sold['status'] == 'sold', ['item_id']]
     
     if len(filtered_sold) == 0:
         return None
@@ -303,10 +348,14 @@ def calculate_liquidity_score(dts_stats, sell_through_stats):
 
 
 def calculate_all_kpis(brand=None, category=None, audience=None, status=None, season=None):
-    """Calculate all KPIs with optional filters."""
+    """Calculate all KPIs with optional filters (memoized per filter combination)."""
+    cache_key = tuple(_filter_key(v) for v in (brand, category, audience, status, season))
+    if cache_key in _KPI_CACHE:
+        return _KPI_CACHE[cache_key]
+    
     logger.info("Calculating KPIs...")
     
-    listings_df, price_events_df = load_all_data()
+    listings_df, price_events_df = _get_data()
     
     filter_desc = []
     if brand: filter_desc.append(f"Brand: {brand}")
@@ -349,12 +398,13 @@ def calculate_all_kpis(brand=None, category=None, audience=None, status=None, se
         },
         'data_counts': {
             'total_listings': len(filtered_all),
-            'active_listings': len(filtered_all[filtered_all['status'] == 'active']),
-            'sold_items': len(filtered_all[filtered_all['status'] == 'sold']),
+            'active_listings': int((filtered_all['status'] == 'active').sum()),
+            'sold_items': int((filtered_all['status'] == 'sold').sum()),
             'price_changes': len(price_events_df)
         }
     }
     
+    _KPI_CACHE[cache_key] = kpis
     return kpis
 
 
@@ -412,7 +462,7 @@ def calculate_kpis_by_brand():
     logger.info("CALCULATING KPIs BY BRAND")
     logger.info("="*70)
     
-    listings_df, _ = load_all_data()
+    listings_df, _ = _get_data()
     brand_col = 'brand_norm' if 'brand_norm' in listings_df.columns else 'brand'
     
     brands = listings_df[brand_col].dropna().unique()
@@ -432,7 +482,7 @@ def calculate_kpis_by_category():
     logger.info("CALCULATING KPIs BY CATEGORY")
     logger.info("="*70)
     
-    listings_df, _ = load_all_data()
+    listings_df, _ = _get_data()
     cat_col = 'category_norm' if 'category_norm' in listings_df.columns else 'category'
     
     categories = listings_df[cat_col].dropna().unique()
@@ -446,6 +496,42 @@ def calculate_kpis_by_category():
     return category_kpis
 
 
+def calculate_brand_liquidity_table(listings_df=None):
+    """
+    Brand-level DTS, 30-day sell-through and liquidity score in one grouped pass.
+    Uses the same formulas as calculate_all_kpis(brand=...) without re-filtering
+    the listings once per brand; use it when only these figures are needed.
+    """
+    if listings_df is None:
+        listings_df, _ = _get_data()
+    
+    brand_col = 'brand_norm' if 'brand_norm' in listings_df.columns else 'brand'
+    df = listings_df[[brand_col, 'status', 'first_seen_at', 'last_seen_at']]
+    sold = df[df['status'] == 'sold']
+    
+    # DTS: (last_seen_at + 24h) - first_seen_at
+    dts = (
+        pd.to_datetime(sold['last_seen_at']) + timedelta(hours=24) - pd.to_datetime(sold['first_seen_at'])
+    ).dt.total_seconds() / (24 * 3600)
+    valid_dts = dts[dts > 0]
+    
+    table = pd.DataFrame({
+        'total_items': df.groupby(brand_col, observed=True).size(),
+        'sold_30d_count': (dts <= 30).groupby(sold[brand_col], observed=True).sum(),
+        'dts_median': valid_dts.groupby(sold[brand_col], observed=True).median()
+    })
+    table['sold_30d_count'] = table['sold_30d_count'].fillna(0).astype(int)
+    
+    # Liquidity score: sell-through (max 50) + DTS (max 50), capped at 100
+    sell_through = (table['sold_30d_count'] / table['total_items'] * 100).clip(upper=100.0)
+    dts_score = ((1 - table['dts_median'] / 30) * 50).clip(lower=0)
+    table['sell_through_30d'] = sell_through
+    table['liquidity_score'] = ((sell_through / 50).clip(upper=1.0) * 50 + dts_score).clip(upper=100.0)
+    
+    table.index.name = 'brand'
+    return table.reset_index()
+
+
 def export_kpis_to_csv(all_kpis, filename="kpis_report.csv"):
     """Export KPIs to CSV format."""
     rows = []
@@ -314,7 +314,7 @@ def detect_sold_items(current_df, previous_df, hours_threshold=48, max_age_days=
         logger.info(f"Detected {len(events_df)} sold items")
         logger.info(f"  - Average DTS (CORRECTED): {events_df['days_to_sell'].mean():.1f} days")
         logger.info(f"  - Median DTS: {events_df['days_to_sell'].median():.1f} days")
-        logger.info(f"  - High confidence (≥96h): {len(events_df[events_df['sold_confidence'] == 1.0])}")
+        logger.info(f"  - High confidence (≥96h): {int((events_df['sold_confidence'] == 1.0).sum())}")
     
     return events_df
 
@@ -401,9 +401,12 @@ def save_processed_data(listings_df, price_events_df, sold_events_df):
     if before_count != after_count:
         logger.warning(f"Removed {before_count - after_count} rows with invalid data")
     
-    # Save listings
+    # Save listings sorted by (status, brand_norm, price) so each row group covers
+    # a narrow status/brand/price range and its min/max statistics can skip it
+    # on read (e.g. active-only price MIN/MAX come straight from the footer)
+    listings_df = listings_df.sort_values(['status', 'brand_norm', 'price'], kind='stable')
     listings_file = DATA_DIR / "processed" / "listings.parquet"
-    listings_df.to_parquet(listings_file, index=False)
+    listings_df.to_parquet(listings_file, index=False, row_group_size=64_000, write_statistics=True)
     logger.info(f"Saved {len(listings_df)} listings to {listings_file}")
     
     # Save price events
@@ -442,8 +445,8 @@ def generate_summary_report(listings_df, price_events_df, sold_events_df):
     logger.info("PROCESSING SUMMARY")
     logger.info("="*60)
     
-    active_count = len(listings_df[listings_df['status'] == 'active'])
-    sold_count = len(listings_df[listings_df['status'] == 'sold'])
+    active_count = int((listings_df['status'] == 'active').sum())
+    sold_count = int((listings_df['status'] == 'sold').sum())
     total_count = len(listings_df)
     
     logger.info(f"\nTotal Unique Items: {total_count}")
@@ -455,11 +458,11 @@ def generate_summary_report(listings_df, price_events_df, sold_events_df):
         logger.warning(f"  ⚠ MISMATCH: Expected {total_count}, got {active_count + sold_count}")
     
     logger.info("\nListings by Brand:")
-    # Fix: Remove NaN values before sorting
-    brands = listings_df['brand_norm'].dropna().unique()
-    for brand in sorted(brands):
-        count = len(listings_df[listings_df['brand_norm'] == brand])
-        active = len(listings_df[(listings_df['brand_norm'] == brand) & (listings_df['status'] == 'active')])
+    # value_counts() skips NaN brands and counts every brand in one pass
+    brand_counts = listings_df['brand_norm'].value_counts().sort_index()
+    active_counts = listings_df.loc[listings_df['status'] == 'active', 'brand_norm'].value_counts()
+    for brand, count in brand_counts.items():
+        active = active_counts.get(brand, 0)
         logger.info(f"  {brand}: {count} total ({active} active)")
     
     logger.info(f"\nPrice Changes: {len(price_events_df)}")
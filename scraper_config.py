@@ -127,11 +127,11 @@ HYBRID_COMBOS = [
 # Delays (in seconds)
 DELAYS = {
     "homepage_load": (4, 7),           # Range: random between min and max
-    "between_pages": (10, 15),         # Base delay between pages
-    "between_categories": (15, 25),    # Delay between different categories
+    "between_pages": (10, 15),         # Base delay between pages (vinted_scraper_enhanced.py only)
+    "between_categories": (15, 25),    # Delay between different categories (vinted_scraper_enhanced.py only)
     "retry_base": 2,                   # Exponential backoff base
     "retry_jitter": (0, 2),            # Random jitter on retries
-    "min_delay": 8                     # Absolute minimum delay
+    "min_delay": 8                     # Absolute minimum delay between pages (vinted_scraper_enhanced.py only)
 }
 
 # User Agents (rotated randomly)
@@ -154,7 +154,14 @@ SCRAPING_HOURS = {
 REQUEST_SETTINGS = {
     "per_page": 960,       # Items per page (max supported by Vinted)
     "timeout": 60000,      # Page load timeout (milliseconds)
-    "retries": 3           # Number of retries per failed request
+    "retries": 3,          # Number of retries per failed request
+    "max_workers": 4,      # Combos scraped in parallel (shared HTTP session)
+    "page_concurrency": 8, # Max in-flight API requests across all workers
+    "cache_ttl": 0,        # Dev only: seconds a cached API page is reused on reruns (0 disables)
+    "rate_limit": 2.0,     # Sustained API requests per second, shared by all workers
+                           # (vinted_scraper.py pacing; replaces the 10-15s between_pages spacing)
+    "rate_burst": 4,       # Requests allowed back-to-back before rate_limit applies
+    "state_ttl": 21600     # Seconds saved browser cookies are reused before reloading the homepage (0 disables)
 }
 
 # ============================================================================
@@ -8,15 +8,32 @@ Features:
 - Comprehensive logging and statistics
 """
 import time
-from playwright.sync_api import sync_playwright
+import csv
+import hashlib
 import json
+import math
+import re
+import threading
+from array import array
+import statistics
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from playwright.sync_api import sync_playwright
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlencode
 from datetime import datetime
 import random
 import logging
-import pandas as pd
 import os
 import sys
 
+# Faster JSON decoding when orjson is installed; the stdlib parser otherwise
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # Import configuration
 try:
     from scraper_config import get_config
@@ -47,19 +64,89 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Headers sent with every API request (browser context and HTTP session)
+HTTP_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+    "Referer": "https://www.vinted.es/",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "same-origin"
+}
+
+class RateLimiter:
+    """Thread-safe token bucket: `rate` requests per second, bursts of up to `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Exponential backoff per retry attempt (jitter is added on top)
+BACKOFF = tuple(DELAYS['retry_base'] ** i for i in range(REQUEST_SETTINGS['retries']))
+
+# Limits concurrent API requests across all combo and page workers
+_REQUEST_SLOTS = threading.BoundedSemaphore(REQUEST_SETTINGS.get('page_concurrency', 8))
+
+# Paces API requests across all workers instead of fixed sleeps
+_RATE_LIMITER = RateLimiter(REQUEST_SETTINGS.get('rate_limit', 2.0), REQUEST_SETTINGS.get('rate_burst', 4))
+
+# On-disk API response cache for development reruns (off unless cache_ttl > 0).
+# Cached pages are written out with the current scrape timestamp, so keep it off
+# for production runs. Pass --no-cache to ignore cached pages (fresh responses are still stored).
+CACHE_DIR = os.path.join(os.getcwd(), ".cache", "vinted_http")
+CACHE_TTL = REQUEST_SETTINGS.get('cache_ttl', 0)
+USE_CACHE = CACHE_TTL > 0 and '--no-cache' not in sys.argv
+
+# Saved browser state (cookies + the user agent they were issued to) reused across runs
+STATE_FILE = os.path.join(os.getcwd(), ".cache", "vinted_state.json")
+STATE_TTL = REQUEST_SETTINGS.get('state_ttl', 0)
+
+# Output columns, in CSV order
+FIELDS = (
+    "item_id", "brand_raw", "category_raw", "title", "size_raw", "condition_raw",
+    "audience", "price", "currency", "published_at", "listing_url", "seller_id",
+    "visible", "season", "season_keyword", "scrape_timestamp"
+)
+
 # Season keywords
 season_keywords = {
     "summer": ["SS24", "SS25", "spring/summer", "verano", "primavera/verano", "summer"],
     "winter": ["FW24", "FW25", "fall/winter", "invierno", "otoño/invierno", "winter"]
 }
 
+# Keywords in configured priority order, plus one case-insensitive alternation used
+# to reject the common no-keyword text in a single scan
+_SEASON_KEYWORDS = [(season, kw, kw.lower()) for season, kws in season_keywords.items() for kw in kws]
+_SEASON_RE = re.compile('|'.join(re.escape(kw) for _, kw, _ in _SEASON_KEYWORDS), re.IGNORECASE)
+
 def extract_season(title, description):
     """Extract season information from title and description."""
-    text = (title + " " + description).lower()
-    for season, kws in season_keywords.items():
-        for kw in kws:
-            if kw.lower() in text:
-                return season, kw
+    text = f"{title} {description}"
+    if not _SEASON_RE.search(text):
+        return None, None
+    # On a hit, the first configured keyword present wins (e.g. "SS24" over "verano")
+    text = text.lower()
+    for season, kw, kw_lower in _SEASON_KEYWORDS:
+        if kw_lower in text:
+            return season, kw
     return None, None
 
 def parse_vinted_timestamp(timestamp_value):
@@ -80,28 +167,28 @@ def parse_vinted_timestamp(timestamp_value):
         logger.warning(f"Could not parse timestamp '{timestamp_value}': {e}")
         return None
 
-def build_api_url(combo, page=1):
-    """Build API URL from combo configuration"""
+API_URL = "https://www.vinted.es/api/v2/catalog/items"
+
+def build_base_query(combo):
+    """Build the page-independent part of a combo's API query string"""
     per_page = REQUEST_SETTINGS['per_page']
     
+    # Unused filters (search_text, status/color/pattern/material ids) are left out
     params = {
-        "page": page,
         "per_page": per_page,
-        "search_text": "",
         "catalog_ids": ",".join(map(str, combo["catalog_ids"])),
-        "order": combo.get("order", "newest_first"),
-        "status_ids": "",
-        "color_ids": "",
-        "patterns_ids": "",
-        "material_ids": ""
+        "order": combo.get("order", "newest_first")
     }
     
     # Add brand_ids only if specified (for brand-specific combos)
     if "brand_ids" in combo:
         params["brand_ids"] = ",".join(map(str, combo["brand_ids"]))
     
-    query = "&".join([f"{k}={v}" for k, v in params.items() if v])
-    return f"https://www.vinted.es/api/v2/catalog/items?{query}"
+    return urlencode(params, safe=',')
+
+def build_api_url(base_query, page=1):
+    """Build API URL for one page from a combo's precomputed base query"""
+    return f"{API_URL}?page={page}&{base_query}"
 
 def is_scraping_hours():
     """Check if current time is within configured scraping window"""
@@ -123,326 +210,563 @@ def random_delay(delay_range):
     min_delay, max_delay = delay_range
     return random.uniform(min_delay, max_delay)
 
-def scrape_vinted(headless=True):
-    """
-    Main scraping function with full configuration support
-    """
-    # Check scraping hours
-    if not is_scraping_hours():
-        logger.warning("Skipping scrape - outside configured hours")
-        return
-    
-    data = []
-    scrape_timestamp = datetime.now()
-    
-    # Randomly select user agent
-    selected_ua = random.choice(USER_AGENTS)
-    logger.info(f"🌐 Using User-Agent: {selected_ua[:60]}...")
-    logger.info(f"📋 Strategy: {len(combos)} combos configured")
-    
+def create_context(browser, user_agent):
+    """Create a browser context with the scraper's headers and fingerprint"""
+    return browser.new_context(
+        user_agent=user_agent,
+        viewport={"width": 1280, "height": 720},
+        bypass_csp=True,
+        java_script_enabled=True,
+        extra_http_headers=HTTP_HEADERS
+    )
+
+def capture_cookies(user_agent, headless=True):
+    """Load the homepage once in a real browser and return its cookies"""
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=headless)
-        context = browser.new_context(
-            user_agent=selected_ua,
-            viewport={"width": 1280, "height": 720},
-            bypass_csp=True,
-            java_script_enabled=True,
-            extra_http_headers={
-                "Accept": "application/json",
-                "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
-                "Referer": "https://www.vinted.es/",
-                "Accept-Encoding": "gzip, deflate, br",
-                "DNT": "1",
-                "Sec-Fetch-Dest": "empty",
-                "Sec-Fetch-Mode": "cors",
-                "Sec-Fetch-Site": "same-origin"
-            }
-        )
-        page = context.new_page()
-
-        # Load homepage for cookies
-        logger.info("🏠 Loading homepage to capture cookies...")
         try:
+            context = create_context(browser, user_agent)
+            page = context.new_page()
+            
+            logger.info("🏠 Loading homepage to capture cookies...")
             page.goto("https://www.vinted.es/", timeout=REQUEST_SETTINGS['timeout'])
             delay = random_delay(DELAYS['homepage_load'])
             time.sleep(delay)
             cookies = context.cookies()
             logger.info(f"✅ Cookies captured: {len(cookies)}")
-        except Exception as e:
-            logger.error(f"❌ Failed to load homepage: {e}")
+            
+            if STATE_TTL > 0:
+                state = context.storage_state()
+                state['user_agent'] = user_agent
+                save_state(state)
+            return cookies
+        finally:
             browser.close()
-            return
 
-        # Process each combo
-        for combo_idx, combo in enumerate(combos):
-            logger.info(f"\n{'='*70}")
-            logger.info(f"[{combo_idx+1}/{len(combos)}] SCRAPING COMBO")
-            logger.info(f"{'='*70}")
-            logger.info(f"📦 Category: {combo.get('category', 'N/A')}")
-            logger.info(f"👥 Audience: {combo.get('audience', 'N/A')}")
-            logger.info(f"🏷️  Brand: {combo.get('brand', 'ALL BRANDS')}")
-            logger.info(f"📊 Order: {combo.get('order', 'newest_first')}")
-            logger.info(f"📄 Max Pages: {combo.get('max_pages', 10)}")
-            logger.info(f"{'='*70}")
+def save_state(state):
+    """Persist the browser storage state so later runs can skip the homepage load"""
+    try:
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        with open(STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not save browser state: {e}")
+
+def load_state(max_age=STATE_TTL):
+    """Return (user_agent, cookies) from a saved state younger than max_age seconds, or None"""
+    try:
+        if time.time() - os.path.getmtime(STATE_FILE) > max_age:
+            return None
+        with open(STATE_FILE, 'rb') as f:
+            state = json_loads(f.read())
+        return state['user_agent'], state['cookies']
+    except (OSError, ValueError, KeyError):
+        return None
+
+def cache_path(api_url):
+    """Cache file for an API URL (the URL encodes combo and page)"""
+    return os.path.join(CACHE_DIR, hashlib.sha1(api_url.encode('utf-8')).hexdigest() + ".json")
+
+def read_cache(api_url, max_age=CACHE_TTL):
+    """Return the cached JSON payload for a URL, or None if missing or older than max_age seconds"""
+    path = cache_path(api_url)
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, 'rb') as f:
+            return json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+def write_cache(api_url, body):
+    """Store a raw response body; written atomically since page workers run concurrently"""
+    path = cache_path(api_url)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not write cache file {path}: {e}")
+
+def create_session(user_agent, cookies):
+    """
+    Build a pooled requests.Session carrying the browser's cookies.
+    Shared by all combo workers; keep-alive connections are reused across pages.
+    """
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    session.headers.update({
+        "User-Agent": user_agent,
+        "X-Requested-With": "XMLHttpRequest",
+        # requests can't decode brotli without the optional brotli package
+        "Accept-Encoding": "gzip, deflate"
+    })
+    
+    jar = requests.cookies.RequestsCookieJar()
+    for c in cookies:
+        jar.set(c['name'], c['value'], domain=c['domain'], path=c['path'])
+    session.cookies = jar
+    
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        # Retries are handled by fetch_page so each one goes through the rate limiter
+        max_retries=0
+    )
+    session.mount("https://", adapter)
+    return session
+
+class CsvSink:
+    """
+    Thread-safe CSV writer shared by all combo workers.
+    Pages are written as soon as they are parsed and de-duplicated on item_id;
+    the summary statistics are tallied on the way through.
+    Rows go to `<filepath>.part`, which the scrape_*.csv globs in process_data.py
+    and run_pipeline.py don't match; publish() renames it once the run has finished.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.part_path = f"{filepath}.part"
+        self.duplicates = 0
+        self.categories = Counter()
+        self.brands = Counter()
+        self.audiences = Counter()
+        self.seasons = Counter()
+        self.prices = array('d')
+        self.published_dates = set()
+        self.published_min = None
+        self.published_max = None
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._file = open(self.part_path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(FIELDS)
+
+    @property
+    def count(self):
+        """Number of unique items written so far"""
+        return len(self._seen)
+
+    def write_columns(self, cols):
+        """Write a page of column lists, skipping item_ids already seen; returns how many were new"""
+        with self._lock:
+            item_ids = cols['item_id']
+            keep = []
+            for i, item_id in enumerate(item_ids):
+                if item_id not in self._seen:
+                    self._seen.add(item_id)
+                    keep.append(i)
             
-            page_num = 1
-            max_pages_limit = combo.get('max_pages', 10)
-            combo_items = 0
+            self.duplicates += len(item_ids) - len(keep)
+            if not keep:
+                return 0
+            if len(keep) < len(item_ids):
+                cols = {k: [v[i] for i in keep] for k, v in cols.items()}
             
-            while page_num <= max_pages_limit:
-                api_url = build_api_url(combo, page=page_num)
-                items = []
-                
-                # Retry logic
-                for attempt in range(REQUEST_SETTINGS['retries']):
-                    try:
-                        logger.info(f"📄 Page {page_num}/{max_pages_limit} - Attempt {attempt+1}")
-                        
-                        response = page.evaluate(f"""
-                            async () => {{
-                                const resp = await fetch('{api_url}', {{
-                                    method: 'GET',
-                                    headers: {{ 
-                                        'Accept': 'application/json',
-                                        'X-Requested-With': 'XMLHttpRequest'
-                                    }},
-                                    credentials: 'include'
-                                }});
-                                return {{ 
-                                    status: resp.status, 
-                                    body: await resp.text(),
-                                    headers: Object.fromEntries(resp.headers.entries())
-                                }};
-                            }}
-                        """)
-                        
-                        if response['status'] != 200:
-                            logger.error(f"❌ HTTP {response['status']}: {response['body'][:200]}")
-                            raise Exception(f"HTTP {response['status']}")
-
-                        json_data = json.loads(response['body'])
-                        items = json_data.get('items', [])
-                        
-                        logger.info(f"✅ Page {page_num}: Found {len(items)} items")
-
-                        if not items:
-                            logger.info(f"🛑 No items on page {page_num} - end of results")
-                            break
-
-                        # Process items
-                        for item in items:
-                            title = item.get('title', 'Unknown')
-                            
-                            # Extract brand (actual brand from API)
-                            brand_raw = item.get('brand_title', 
-                                               item.get('brand', {}).get('title', 'Unknown'))
-                            
-                            category_raw = combo.get('category', 'Unknown')
-                            
-                            # Extract size
-                            size_raw = ''
-                            if item.get('size_title'):
-                                size_raw = item.get('size_title')
-                            elif item.get('size') and isinstance(item.get('size'), dict):
-                                size_raw = item.get('size', {}).get('title', '')
-                            
-                            condition_raw = item.get('status', '')
-                            
-                            # Parse price
-                            price_dict = item.get('price', {})
-                            try:
-                                if isinstance(price_dict, dict) and price_dict.get('amount'):
-                                    amount = str(price_dict.get('amount', '0')).replace(',', '.')
-                                    price = float(amount)
-                                else:
-                                    price = 0.0
-                            except (ValueError, AttributeError):
-                                price = 0.0
-                            
-                            currency = price_dict.get('currency', 'EUR') if isinstance(price_dict, dict) else 'EUR'
-                            
-                            # Extract timestamp
-                            published_at_raw = None
-                            photo_data = item.get('photo', {})
-                            if isinstance(photo_data, dict):
-                                high_res = photo_data.get('high_resolution', {})
-                                if isinstance(high_res, dict):
-                                    published_at_raw = high_res.get('timestamp')
-                            
-                            if not published_at_raw:
-                                published_at_raw = (
-                                    item.get('created_at_ts') or
-                                    item.get('created_at') or
-                                    item.get('updated_at_ts')
-                                )
-                            
-                            published_at = parse_vinted_timestamp(published_at_raw)
-                            if published_at is None:
-                                published_at = scrape_timestamp
-                            
-                            # Other fields
-                            item_id = item.get('id', 'Unknown')
-                            listing_url = item.get('url', f"https://www.vinted.es/items/{item_id}")
-                            seller_id = str(item.get('user', {}).get('id', 'Unknown'))
-                            audience = combo.get('audience', 'Unknown')
-                            description = item.get('description', '')
-                            season, season_keyword = extract_season(title, description)
-                            visible = item.get('is_visible', True)
-
-                            item_data = {
-                                "item_id": item_id,
-                                "brand_raw": brand_raw,
-                                "category_raw": category_raw,
-                                "title": title,
-                                "size_raw": size_raw,
-                                "condition_raw": condition_raw,
-                                "audience": audience,
-                                "price": price,
-                                "currency": currency,
-                                "published_at": published_at.isoformat(),
-                                "listing_url": listing_url,
-                                "seller_id": seller_id,
-                                "visible": visible,
-                                "season": season,
-                                "season_keyword": season_keyword,
-                                "scrape_timestamp": scrape_timestamp.isoformat()
-                            }
-                            data.append(item_data)
-                            combo_items += 1
-
-                        # Check pagination
-                        pagination = json_data.get('pagination', {})
-                        api_total_pages = pagination.get('total_pages', None)
-                        total_entries = pagination.get('total_entries', None)
-                        
-                        if api_total_pages:
-                            logger.info(f"📊 API: {total_entries:,} items, {api_total_pages} pages available")
-                        
-                        # Stop if no more pages
-                        if not pagination.get('next_page') or len(items) < REQUEST_SETTINGS['per_page']:
-                            logger.info(f"✋ No more pages available")
-                            break
-
-                        page_num += 1
-                        break  # Success, exit retry loop
-                        
-                    except Exception as e:
-                        logger.error(f"❌ Attempt {attempt+1} failed: {e}")
-                        
-                        if attempt < REQUEST_SETTINGS['retries'] - 1:
-                            retry_delay = (DELAYS['retry_base'] ** attempt) + random_delay(DELAYS['retry_jitter'])
-                            logger.info(f"⏳ Retrying in {retry_delay:.1f}s...")
-                            time.sleep(retry_delay)
-                        else:
-                            logger.warning(f"⚠️ All retries exhausted for page {page_num}")
-                            break
-                
-                # Exit if no items were retrieved
-                if not items:
-                    break
-                
-                # Delay before next page
-                if page_num <= max_pages_limit:
-                    base_delay = random_delay(DELAYS['between_pages'])
-                    page_factor = (page_num // 3) * 1.0  # Increase delay every 3 pages
-                    jitter = random.uniform(-1, 2)
-                    delay = max(DELAYS['min_delay'], base_delay + page_factor + jitter)
-                    
-                    logger.info(f"⏳ Waiting {delay:.1f}s before next page...")
-                    time.sleep(delay)
-
-            logger.info(f"✅ Combo complete: {combo_items:,} items from {combo.get('category', 'combo')}")
+            self._writer.writerows(zip(*(cols[k] for k in FIELDS)))
+            # Flush per page so an aborted run's .part file holds every page written
+            # so far for inspection; it is never published under the scrape name
+            self._file.flush()
+            self._tally(cols)
+        return len(keep)
+
+    def _tally(self, cols):
+        self.categories.update(cols['category_raw'])
+        self.brands.update(cols['brand_raw'])
+        self.audiences.update(cols['audience'])
+        self.seasons.update(season for season in cols['season'] if season)
+        self.prices.extend(cols['price'])
+
+        # ISO timestamps sort lexicographically; offsets are ignored for the summary
+        published = [ts[:19] for ts in cols['published_at']]
+        self.published_dates.update(ts[:10] for ts in published)
+        page_min, page_max = min(published), max(published)
+        if self.published_min is None or page_min < self.published_min:
+            self.published_min = page_min
+        if self.published_max is None or page_max > self.published_max:
+            self.published_max = page_max
+
+    def close(self):
+        self._file.close()
+
+    def publish(self):
+        """Move the finished file to its final name so processing picks it up"""
+        os.replace(self.part_path, self.filepath)
+
+    def discard(self):
+        os.remove(self.part_path)
+
+def parse_items(items, combo, scrape_timestamp):
+    """Convert raw API items into column lists (keyed by FIELDS) for the given combo"""
+    cols = {field: [] for field in FIELDS}
+    
+    # Per-combo constants, filled in once per page after the loop
+    category_raw = combo.get('category', 'Unknown')
+    audience = combo.get('audience', 'Unknown')
+    scraped_at = scrape_timestamp.isoformat()
+    
+    for item in items:
+        g = item.get
+        title = g('title', 'Unknown')
+
+        # Extract brand (actual brand from API)
+        brand_raw = g('brand_title') or (g('brand') or {}).get('title', 'Unknown')
+
+        # Extract size
+        size_obj = g('size')
+        size_raw = g('size_title') or (size_obj.get('title', '') if isinstance(size_obj, dict) else '')
+
+        condition_raw = g('status', '')
+
+        # Parse price
+        price_dict = g('price')
+        if isinstance(price_dict, dict):
+            amount = price_dict.get('amount')
+            currency = price_dict.get('currency', 'EUR')
+        else:
+            amount, currency = None, 'EUR'
+        try:
+            price = float(str(amount).replace(',', '.')) if amount else 0.0
+        except ValueError:
+            price = 0.0
+
+        # Extract timestamp: photo upload time first, then the item's own timestamps
+        photo_data = g('photo')
+        high_res = photo_data.get('high_resolution') if isinstance(photo_data, dict) else None
+        published_at_raw = (
+            (high_res.get('timestamp') if isinstance(high_res, dict) else None) or
+            g('created_at_ts') or
+            g('created_at') or
+            g('updated_at_ts')
+        )
+
+        published_at = parse_vinted_timestamp(published_at_raw)
+        if published_at is None:
+            published_at = scrape_timestamp
+
+        # Other fields
+        item_id = g('id', 'Unknown')
+        listing_url = g('url') or f"https://www.vinted.es/items/{item_id}"
+        seller_id = str((g('user') or {}).get('id', 'Unknown'))
+        description = g('description', '')
+        season, season_keyword = extract_season(title, description)
+        visible = g('is_visible', True)
+
+        cols["item_id"].append(item_id)
+        cols["brand_raw"].append(brand_raw)
+        cols["title"].append(title)
+        cols["size_raw"].append(size_raw)
+        cols["condition_raw"].append(condition_raw)
+        cols["price"].append(price)
+        cols["currency"].append(currency)
+        cols["published_at"].append(published_at.isoformat())
+        cols["listing_url"].append(listing_url)
+        cols["seller_id"].append(seller_id)
+        cols["visible"].append(visible)
+        cols["season"].append(season)
+        cols["season_keyword"].append(season_keyword)
+
+    count = len(cols["item_id"])
+    cols["category_raw"] = [category_raw] * count
+    cols["audience"] = [audience] * count
+    cols["scrape_timestamp"] = [scraped_at] * count
+    return cols
+
+def fetch_page(session, combo, base_query, page_num, label):
+    """
+    Fetch one API page with retries.
+    Returns the decoded JSON payload, or None if every attempt failed.
+    """
+    api_url = build_api_url(base_query, page=page_num)
+    max_pages_limit = combo.get('max_pages', 10)
+    
+    if USE_CACHE:
+        cached = read_cache(api_url)
+        if cached is not None:
+            logger.info("💾 %s: Page %d/%d - served from cache", label, page_num, max_pages_limit)
+            return cached
+    
+    for attempt in range(REQUEST_SETTINGS['retries']):
+        retry_after = 0
+        try:
+            logger.info("📄 %s: Page %d/%d - Attempt %d", label, page_num, max_pages_limit, attempt + 1)
+            
+            # Pace and cap in-flight requests to Vinted across all combo workers
+            _RATE_LIMITER.acquire()
+            with _REQUEST_SLOTS:
+                response = session.get(api_url, timeout=REQUEST_SETTINGS['timeout'] / 1000)
             
-            # Delay between combos
-            if combo_idx < len(combos) - 1:
-                inter_combo_delay = random_delay(DELAYS['between_categories'])
-                logger.info(f"⏸️  Waiting {inter_combo_delay:.1f}s before next combo...")
-                time.sleep(inter_combo_delay)
+            if response.status_code != 200:
+                logger.error(f"❌ {label}: HTTP {response.status_code}: {response.text[:200]}")
+                # Honour the server's Retry-After when it throttles us
+                header = response.headers.get('Retry-After', '')
+                retry_after = int(header) if header.isdigit() else 0
+                raise Exception(f"HTTP {response.status_code}")
 
-        browser.close()
+            json_data = json_loads(response.content)
+            if CACHE_TTL > 0:
+                write_cache(api_url, response.content)
+            return json_data
+            
+        except Exception as e:
+            logger.error(f"❌ {label}: Attempt {attempt+1} failed: {e}")
+            
+            if attempt < REQUEST_SETTINGS['retries'] - 1:
+                # Only this page's worker sleeps; other pages and combos keep going
+                retry_delay = max(BACKOFF[attempt] + random_delay(DELAYS['retry_jitter']), retry_after)
+                logger.info("⏳ %s: Retrying in %.1fs...", label, retry_delay)
+                time.sleep(retry_delay)
+    
+    logger.warning(f"⚠️ {label}: All retries exhausted for page {page_num}")
+    return None
 
-    # Save results
-    if not data:
-        logger.error("❌ No data collected! Check logs for errors.")
-        return
+def write_page(items, combo, page_num, label, scrape_timestamp, sink):
+    """
+    Parse one page of items and write it to the sink.
+    Returns (new item count, item ids on the page). A page that fails to parse
+    is logged and skipped so one bad payload doesn't abort the whole run.
+    """
+    try:
+        cols = parse_items(items, combo, scrape_timestamp)
+        return sink.write_columns(cols), set(cols['item_id'])
+    except Exception as e:
+        logger.error(f"❌ {label}: Skipping page {page_num} - could not parse items: {e}")
+        return 0, set()
+
+def session_is_valid(session):
+    """Check with a single one-item API request that the session's cookies are accepted"""
+    _RATE_LIMITER.acquire()
+    try:
+        with _REQUEST_SLOTS:
+            response = session.get(build_api_url(urlencode({"per_page": 1})),
+                                   timeout=REQUEST_SETTINGS['timeout'] / 1000)
+    except requests.RequestException as e:
+        logger.warning(f"⚠️ Session check failed: {e}")
+        return False
+    return response.status_code == 200
+
+def scrape_combo(combo, combo_idx, session, scrape_timestamp, sink):
+    """
+    Scrape every page of a single combo.
+    Page 1 is fetched first to learn the page count; the remaining pages
+    are then fetched concurrently over the shared HTTP session.
+    Rows are written to the sink page by page.
+    Returns the number of new items this combo contributed.
+    """
+    written = 0
+    label = f"[{combo_idx+1}/{len(combos)}] {combo.get('category', 'combo')}"
+
+    # Skip building the banner entirely when INFO is filtered out
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"\n{'='*70}")
+        logger.info(f"{label} SCRAPING COMBO")
+        logger.info(f"{'='*70}")
+        logger.info(f"📦 Category: {combo.get('category', 'N/A')}")
+        logger.info(f"👥 Audience: {combo.get('audience', 'N/A')}")
+        logger.info(f"🏷️  Brand: {combo.get('brand', 'ALL BRANDS')}")
+        logger.info(f"📊 Order: {combo.get('order', 'newest_first')}")
+        logger.info(f"📄 Max Pages: {combo.get('max_pages', 10)}")
+        logger.info(f"{'='*70}")
 
-    save_results(data)
+    max_pages_limit = combo.get('max_pages', 10)
+    base_query = build_base_query(combo)
+    
+    # Probe page 1 for items and pagination metadata
+    json_data = fetch_page(session, combo, base_query, 1, label)
+    if json_data is None:
+        return written
+    
+    items = json_data.get('items', [])
+    logger.info("✅ %s: Page 1: Found %d items", label, len(items))
+    if not items:
+        logger.info(f"🛑 {label}: No items on page 1 - end of results")
+        return written
+    page_written, combo_ids = write_page(items, combo, 1, label, scrape_timestamp, sink)
+    written += page_written
+    
+    # The probe's pagination is authoritative: never request past the last page
+    pagination = json_data.get('pagination', {})
+    api_total_pages = pagination.get('total_pages', None)
+    total_entries = pagination.get('total_entries', None)
+    if not api_total_pages and total_entries:
+        page_size = pagination.get('per_page') or REQUEST_SETTINGS['per_page']
+        api_total_pages = math.ceil(total_entries / page_size)
+    
+    if api_total_pages:
+        logger.info(f"📊 {label}: API: {total_entries or 0:,} items, {api_total_pages} pages available")
+    last_page = min(api_total_pages or 1, max_pages_limit)
+    
+    if last_page > 1:
+        logger.info(f"🚀 {label}: Fetching pages 2-{last_page} concurrently")
+        with ThreadPoolExecutor(max_workers=REQUEST_SETTINGS.get('page_concurrency', 8)) as pool:
+            # Every page is submitted up front; parse each one as soon as it
+            # lands while the later pages are still in flight
+            futures = [
+                pool.submit(fetch_page, session, combo, base_query, n, label)
+                for n in range(2, last_page + 1)
+            ]
+            
+            for page_num, future in enumerate(futures, start=2):
+                page_data = future.result()
+                if page_data is None:
+                    continue
+                page_items = page_data.get('items', [])
+                logger.info("✅ %s: Page %d: Found %d items", label, page_num, len(page_items))
+                page_written, page_ids = write_page(page_items, combo, page_num, label, scrape_timestamp, sink)
+                written += page_written
+                
+                # A page made only of items this combo already returned means the
+                # listing has wrapped around; drop the pages not yet fetched
+                if page_ids and page_ids <= combo_ids:
+                    logger.info(f"🛑 {label}: Page {page_num} had no new items - stopping early")
+                    for pending in futures[page_num - 1:]:
+                        pending.cancel()
+                    break
+                combo_ids |= page_ids
+    else:
+        logger.info(f"✋ {label}: No more pages available")
+
+    logger.info(f"✅ Combo complete: {written:,} items from {combo.get('category', 'combo')}")
 
-def save_results(data):
-    """Save scraped data to CSV with comprehensive statistics"""
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-    filename = f"vinted_scrape_{timestamp}.csv"
+    return written
 
-    # Ensure output directory
+def scrape_vinted(headless=True):
+    """
+    Main scraping function with full configuration support.
+    Combos are scraped concurrently, one worker thread per combo.
+    """
+    # Check scraping hours
+    if not is_scraping_hours():
+        logger.warning("Skipping scrape - outside configured hours")
+        return
+    
+    scrape_timestamp = datetime.now()
+    
+    # Reuse recent cookies (and their user agent) when available; --no-cache forces a fresh load
+    saved_state = load_state() if STATE_TTL > 0 and '--no-cache' not in sys.argv else None
+    if saved_state:
+        selected_ua, cookies = saved_state
+        logger.info(f"🍪 Reusing saved browser state ({len(cookies)} cookies)")
+    else:
+        # Randomly select user agent
+        selected_ua = random.choice(USER_AGENTS)
+    logger.info(f"🌐 Using User-Agent: {selected_ua[:60]}...")
+    logger.info(f"📋 Strategy: {len(combos)} combos configured")
+    
+    session = create_session(selected_ua, cookies) if saved_state else None
+    
+    # Saved cookies may have expired or been revoked; check once and reload them in this run
+    if session is not None and not session_is_valid(session):
+        logger.warning("⚠️ Saved browser state was rejected - reloading homepage")
+        session.close()
+        session = None
+        saved_state = None
+    
+    # The browser is only needed once, to pick up session cookies
+    if session is None:
+        try:
+            cookies = capture_cookies(selected_ua, headless=headless)
+        except Exception as e:
+            logger.error(f"❌ Failed to load homepage: {e}")
+            return
+        session = create_session(selected_ua, cookies)
+    
+    # Ensure output directory; rows are streamed here as pages arrive
     output_dir = os.path.join(os.getcwd(), "data", "scrapes")
     os.makedirs(output_dir, exist_ok=True)
-    filepath = os.path.join(output_dir, filename)
+    filename = f"vinted_scrape_{scrape_timestamp.strftime('%Y-%m-%d_%H%M%S')}.csv"
+    sink = CsvSink(os.path.join(output_dir, filename))
+    
+    max_workers = min(REQUEST_SETTINGS.get('max_workers', len(combos)), len(combos))
+    logger.info(f"🧵 Scraping with {max_workers} parallel workers")
+    
+    completed = False
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(
+                lambda args: scrape_combo(args[1], args[0], session, scrape_timestamp, sink),
+                enumerate(combos)
+            ))
+        completed = True
+    finally:
+        session.close()
+        sink.close()
+        # An aborted run must not look like a complete scrape: processing would
+        # mark every item missing from it as sold
+        if not completed:
+            logger.error(f"❌ Scrape aborted - partial rows left in {sink.part_path}")
 
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
+    if not sink.count:
+        logger.error("❌ No data collected! Check logs for errors.")
+        sink.discard()
+        # Saved cookies may have expired; make the next run load the homepage again
+        if saved_state and os.path.exists(STATE_FILE):
+            os.remove(STATE_FILE)
+        return
 
-    # Remove duplicates
-    original_count = len(df)
-    df = df.drop_duplicates(subset=['item_id'], keep='first')
-    removed_dupes = original_count - len(df)
+    sink.publish()
+    if sink.duplicates > 0:
+        logger.info(f"🔄 Removed {sink.duplicates} duplicate items")
 
-    if removed_dupes > 0:
-        logger.info(f"🔄 Removed {removed_dupes} duplicate items")
+    save_results(sink)
 
-    # Save to CSV
-    df.to_csv(filepath, index=False, encoding='utf-8')
+def save_results(sink):
+    """Print comprehensive statistics for a completed scrape"""
+    total = sink.count
     
     # Print comprehensive statistics
     logger.info(f"\n{'='*70}")
     logger.info(f"✅ SCRAPING COMPLETE")
     logger.info(f"{'='*70}")
-    logger.info(f"📊 Total unique items: {len(df):,}")
-    logger.info(f"📁 Saved to: {filepath}")
+    logger.info(f"📊 Total unique items: {total:,}")
+    logger.info(f"📁 Saved to: {sink.filepath}")
     
     # Category breakdown
     logger.info(f"\n📦 Items by Category:")
-    for category in sorted(df['category_raw'].unique()):
-        cat_count = len(df[df['category_raw'] == category])
-        pct = (cat_count / len(df)) * 100
+    for category, cat_count in sorted(sink.categories.items()):
+        pct = (cat_count / total) * 100
         logger.info(f"  • {category:20s}: {cat_count:6,} ({pct:5.1f}%)")
     
     # Brand breakdown (top 15)
     logger.info(f"\n🏷️  Top 15 Brands:")
-    brand_counts = df['brand_raw'].value_counts().head(15)
-    for brand, count in brand_counts.items():
-        pct = (count / len(df)) * 100
+    for brand, count in sink.brands.most_common(15):
+        pct = (count / total) * 100
         logger.info(f"  • {brand:20s}: {count:6,} ({pct:5.1f}%)")
     
     # Audience breakdown
     logger.info(f"\n👥 Items by Audience:")
-    for audience in sorted(df['audience'].unique()):
-        aud_count = len(df[df['audience'] == audience])
-        pct = (aud_count / len(df)) * 100
+    for audience, aud_count in sorted(sink.audiences.items()):
+        pct = (aud_count / total) * 100
         logger.info(f"  • {audience:20s}: {aud_count:6,} ({pct:5.1f}%)")
     
     # Date range
-    df['published_at'] = pd.to_datetime(df['published_at'])
+    earliest = datetime.fromisoformat(sink.published_min)
+    latest = datetime.fromisoformat(sink.published_max)
     logger.info(f"\n📅 Published Date Range:")
-    logger.info(f"  Earliest: {df['published_at'].min().strftime('%Y-%m-%d %H:%M')}")
-    logger.info(f"  Latest:   {df['published_at'].max().strftime('%Y-%m-%d %H:%M')}")
-    logger.info(f"  Span:     {(df['published_at'].max() - df['published_at'].min()).days} days")
-    logger.info(f"  Unique dates: {df['published_at'].dt.date.nunique()}")
+    logger.info(f"  Earliest: {earliest.strftime('%Y-%m-%d %H:%M')}")
+    logger.info(f"  Latest:   {latest.strftime('%Y-%m-%d %H:%M')}")
+    logger.info(f"  Span:     {(latest - earliest).days} days")
+    logger.info(f"  Unique dates: {len(sink.published_dates)}")
     
-    # Price statistics
+    # Price statistics (linear-interpolated quartiles)
+    prices = sink.prices
+    p25, p50, p75 = statistics.quantiles(prices, n=4, method='inclusive') if len(prices) > 1 else prices * 3
     logger.info(f"\n💰 Price Statistics (EUR):")
-    logger.info(f"  Min:     €{df['price'].min():8.2f}")
-    logger.info(f"  P25:     €{df['price'].quantile(0.25):8.2f}")
-    logger.info(f"  Median:  €{df['price'].median():8.2f}")
-    logger.info(f"  P75:     €{df['price'].quantile(0.75):8.2f}")
-    logger.info(f"  Max:     €{df['price'].max():8.2f}")
-    logger.info(f"  Mean:    €{df['price'].mean():8.2f}")
+    logger.info(f"  Min:     €{min(prices):8.2f}")
+    logger.info(f"  P25:     €{p25:8.2f}")
+    logger.info(f"  Median:  €{p50:8.2f}")
+    logger.info(f"  P75:     €{p75:8.2f}")
+    logger.info(f"  Max:     €{max(prices):8.2f}")
+    logger.info(f"  Mean:    €{statistics.fmean(prices):8.2f}")
     
     # Season breakdown (if available)
-    if 'season' in df.columns and df['season'].notna().any():
+    if sink.seasons:
         logger.info(f"\n🌡️  Items by Season:")
-        season_counts = df['season'].value_counts()
-        for season, count in season_counts.items():
-            pct = (count / len(df)) * 100
+        for season, count in sink.seasons.most_common():
+            pct = (count / total) * 100
             logger.info(f"  • {season:20s}: {count:6,} ({pct:5.1f}%)")
     
     logger.info(f"\n{'='*70}")
@@ -455,11 +779,17 @@ if __name__ == "__main__":
     logger.info(f"{'='*70}")
     logger.info(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    exit_code = 0
     try:
         scrape_vinted(headless=True)
     except KeyboardInterrupt:
         logger.warning("\n⚠️  Scraping interrupted by user")
+        exit_code = 130
     except Exception as e:
         logger.error(f"\n❌ Fatal error: {e}", exc_info=True)
+        exit_code = 1
     finally:
-        logger.info(f"Ended at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
\ No newline at end of file
+        logger.info(f"Ended at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    # Non-zero exit stops run_pipeline.py and the workflow before processing
+    sys.exit(exit_code)
\ No newline at end of file